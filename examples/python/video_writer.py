@@ -1,47 +1,162 @@
 """Video writer helpers for Matplotlib animations.
 
 Uses NVIDIA NVENC when available and falls back to libx264 with an explicit log.
+Set SYMBANAFIS_VIDEO_BACKEND to "gpu" or "cpu" to skip the encoder probe
+("auto", the default, probes ffmpeg once per process).
+
+On the libx264 fallback (Linux by default), frames are rasterized by a pool
+of forked worker processes and streamed in order to a single ffmpeg process. This requires the
+animation's update function to depend only on the frame index (true for all
+examples here, which replay precomputed histories).
 """
 
 from __future__ import annotations
 
+import functools
+import io
+import multiprocessing
+import os
 import shutil
 import subprocess
+import sys
+import threading
+import warnings
 from pathlib import Path
 
+_BACKEND = os.environ.get("SYMBANAFIS_VIDEO_BACKEND", "auto").strip().lower()
+
+# (animation, savefig kwargs) inherited by forked render workers
+_RENDER_STATE = None
 
+
+@functools.lru_cache(maxsize=1)
 def _has_ffmpeg() -> bool:
     return shutil.which("ffmpeg") is not None
 
 
+@functools.lru_cache(maxsize=1)
 def _has_nvenc_encoder() -> bool:
-    if not _has_ffmpeg():
+    if _BACKEND == "gpu":
+        return True
+    if _BACKEND == "cpu" or not _has_ffmpeg():
         return False
     try:
+        # Query only the NVENC encoder instead of listing every encoder
         proc = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-encoders"],
+            ["ffmpeg", "-hide_banner", "-h", "encoder=h264_nvenc"],
             capture_output=True,
             text=True,
             check=False,
         )
-        return "h264_nvenc" in proc.stdout
+        return proc.returncode == 0 and "Encoder h264_nvenc" in proc.stdout
     except Exception:
         return False
 
 
+def _frame_savefig_kwargs(fig, writer) -> dict:
+    """savefig kwargs matching what Animation.save passes to grab_frame."""
+    import matplotlib as mpl
+    import matplotlib.colors as mcolors
+
+    kwargs = {"dpi": writer.dpi}
+    if not writer._supports_transparency():
+        # Same as Animation.save: pre-composite the facecolor onto white so
+        # non-alpha codecs get the colour shown on screen
+        facecolor = mpl.rcParams["savefig.facecolor"]
+        if facecolor == "auto":
+            facecolor = fig.get_facecolor()
+        r, g, b, a = mcolors.to_rgba(facecolor)
+        kwargs["facecolor"] = (a * r + 1 - a, a * g + 1 - a, a * b + 1 - a)
+        kwargs["transparent"] = False
+    return kwargs
+
+
+def _render_frame(frame) -> bytes:
+    ani, savefig_kwargs = _RENDER_STATE
+    ani._func(frame, *ani._args)
+    buf = io.BytesIO()
+    ani._fig.savefig(buf, format="rgba", **savefig_kwargs)
+    return buf.getvalue()
+
+
+def _save_parallel(ani, writer, out_path: Path, dpi: int, workers: int) -> None:
+    """Render frames in forked workers and pipe them to one ffmpeg writer."""
+    global _RENDER_STATE
+
+    frames = list(ani.new_saved_frame_seq())
+    # Frames are drawn by the workers; silence the "never rendered" warning
+    ani._draw_was_started = True
+
+    # One continuous imap stream keeps every worker busy (no per-batch
+    # barrier). Memory is bounded by gating the task feed: the pool's feeder
+    # thread blocks on `slots` until the parent has written an earlier frame,
+    # so at most `in_flight` full RGBA buffers are pending at once.
+    in_flight = workers * 4
+    slots = threading.Semaphore(in_flight)
+    stop = threading.Event()
+
+    def feed():
+        for frame in frames:
+            slots.acquire()
+            if stop.is_set():
+                return
+            yield frame
+
+    with writer.saving(ani._fig, str(out_path), dpi):
+        # As in Animation.save: run init_func (or draw the first frame) once
+        # before any frame; the forked workers inherit the resulting state
+        ani._init_draw()
+        # Set after setup() so workers see the even-sized figure and writer dpi
+        _RENDER_STATE = (ani, _frame_savefig_kwargs(ani._fig, writer))
+        try:
+            with warnings.catch_warnings():
+                # Callers usually ran a threaded symb_anafis simulation first
+                # (Python 3.12+ warns on fork then); the workers only render
+                # with matplotlib and never touch those threads' state
+                warnings.filterwarnings(
+                    "ignore",
+                    message=r".*multi-threaded, use of fork\(\) may lead to deadlocks",
+                    category=DeprecationWarning,
+                )
+                pool = multiprocessing.get_context("fork").Pool(workers)
+            with pool:
+                try:
+                    # chunksize=1: a larger chunk could wait on slots held by
+                    # its own unwritten frames; IPC cost is small next to a render
+                    for data in pool.imap(_render_frame, feed(), chunksize=1):
+                        writer._proc.stdin.write(data)
+                        slots.release()
+                finally:
+                    # Unblock the feeder thread so the pool can shut down on error
+                    stop.set()
+                    slots.release(in_flight)
+        finally:
+            _RENDER_STATE = None
+
+
 def save_animation_mp4(
     ani,
     out_path: Path,
     fps: int = 30,
     dpi: int = 100,
     cq: int = 24,
+    workers: int | None = None,
 ) -> str:
     """Save animation using NVENC when available.
 
+    Args:
+        workers: Render processes for the libx264 fallback. Defaults to one
+            less than the CPU count on Linux and 1 elsewhere; 1, no fork
+            support, or an animation that is not a FuncAnimation renders
+            serially via ani.save. Parallel rendering requires the
+            animation's update function to depend only on the frame index
+            (each worker sees frames out of order and its own figure copy);
+            pass workers=1 for updates that carry state between frames.
+
     Returns:
         "GPU" if NVENC was used, else "CPU".
     """
-    from matplotlib.animation import FFMpegWriter
+    from matplotlib.animation import FFMpegWriter, FuncAnimation
 
     out_path.parent.mkdir(exist_ok=True)
 
@@ -68,5 +183,22 @@ def save_animation_mp4(
         codec="libx264",
         extra_args=["-preset", "medium", "-crf", "23", "-movflags", "+faststart"],
     )
-    ani.save(str(out_path), writer=writer, dpi=dpi)
+    if workers is None:
+        # Fork after matplotlib/Accelerate/Cocoa have started is unsafe on
+        # macOS, so only parallelize by default on Linux
+        if sys.platform.startswith("linux"):
+            # Leave one core for the ffmpeg encoder
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        else:
+            workers = 1
+    # Workers replay frames through FuncAnimation's update function; other
+    # Animation types (e.g. ArtistAnimation) always go through ani.save
+    if (
+        isinstance(ani, FuncAnimation)
+        and workers > 1
+        and "fork" in multiprocessing.get_all_start_methods()
+    ):
+        _save_parallel(ani, writer, out_path, dpi, workers)
+    else:
+        ani.save(str(out_path), writer=writer, dpi=dpi)
     return "CPU"
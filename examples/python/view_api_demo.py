@@ -3,48 +3,185 @@ View API Demo - Pattern Matching on Expression Structure
 
 Demonstrates the new View API for inspecting expression structure
 without exposing internal implementation details.
+
+Pass `--profile PATH.prof` to run the demo under cProfile and dump the
+stats to PATH.prof (view them with `snakeviz PATH.prof`).
 """
 
+import sys
+
 import symb_anafis as sa
 
+# Indentation prefixes for common depths (deeper levels are built on demand)
+_INDENTS = ["  " * i for i in range(64)]
+
 
 def print_structure(expr, indent=0):
-    """Recursively print expression structure using View API"""
-    view = expr.view()
-    prefix = "  " * indent
-    
-    if view.is_number:
-        print(f"{prefix}Number: {view.value}")
-    elif view.is_symbol:
-        print(f"{prefix}Symbol: {view.name}")
-    elif view.is_sum:
-        print(f"{prefix}Sum ({len(view.children)} terms):")
-        for child in view.children:
-            print_structure(child, indent + 1)
-    elif view.is_product:
-        print(f"{prefix}Product ({len(view.children)} factors):")
-        for child in view.children:
-            print_structure(child, indent + 1)
-    elif view.is_div:
-        print(f"{prefix}Division:")
-        print(f"{prefix}  Numerator:")
-        print_structure(view.children[0], indent + 2)
-        print(f"{prefix}  Denominator:")
-        print_structure(view.children[1], indent + 2)
-    elif view.is_pow:
-        print(f"{prefix}Power:")
-        print(f"{prefix}  Base:")
-        print_structure(view.children[0], indent + 2)
-        print(f"{prefix}  Exponent:")
-        print_structure(view.children[1], indent + 2)
-    elif view.is_function:
-        print(f"{prefix}Function: {view.name} ({len(view.children)} args)")
-        for i, child in enumerate(view.children):
-            print(f"{prefix}  Arg {i}:")
-            print_structure(child, indent + 2)
-    elif view.is_derivative:
-        print(f"{prefix}Derivative: d^{view.derivative_order}/d{view.derivative_var}^{view.derivative_order}")
-        print_structure(view.children[0], indent + 1)
+    """Print expression structure using View API
+
+    Lines are collected and written to stdout in one call.
+    """
+    out = []
+    _collect_structure(expr, indent, out)
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+# Structure handlers: (view, prefix, indent, stack, out) -> None.
+# Each appends the node's own line and pushes its children (and label lines)
+# onto the stack in reverse so they pop in order.
+
+def _structure_number(view, prefix, indent, stack, out):
+    out.append(f"{prefix}Number: {view.value}")
+
+
+def _structure_symbol(view, prefix, indent, stack, out):
+    out.append(f"{prefix}Symbol: {view.name}")
+
+
+def _structure_sum(view, prefix, indent, stack, out):
+    kids = view.children
+    out.append(f"{prefix}Sum ({len(kids)} terms):")
+    stack.extend((child, indent + 1) for child in reversed(kids))
+
+
+def _structure_product(view, prefix, indent, stack, out):
+    kids = view.children
+    out.append(f"{prefix}Product ({len(kids)} factors):")
+    stack.extend((child, indent + 1) for child in reversed(kids))
+
+
+def _structure_div(view, prefix, indent, stack, out):
+    num, den = view.children
+    out.append(f"{prefix}Division:")
+    stack.append((den, indent + 2))
+    stack.append(("Denominator:", indent + 1))
+    stack.append((num, indent + 2))
+    stack.append(("Numerator:", indent + 1))
+
+
+def _structure_pow(view, prefix, indent, stack, out):
+    base, exp = view.children
+    out.append(f"{prefix}Power:")
+    stack.append((exp, indent + 2))
+    stack.append(("Exponent:", indent + 1))
+    stack.append((base, indent + 2))
+    stack.append(("Base:", indent + 1))
+
+
+def _structure_function(view, prefix, indent, stack, out):
+    kids = view.children
+    out.append(f"{prefix}Function: {view.name} ({len(kids)} args)")
+    for i in reversed(range(len(kids))):
+        stack.append((kids[i], indent + 2))
+        stack.append((f"Arg {i}:", indent + 1))
+
+
+def _structure_derivative(view, prefix, indent, stack, out):
+    order = view.derivative_order
+    out.append(f"{prefix}Derivative: d^{order}/d{view.derivative_var}^{order}")
+    stack.append((view[0], indent + 1))
+
+
+_STRUCTURE_HANDLERS = {
+    "Number": _structure_number,
+    "Symbol": _structure_symbol,
+    "Sum": _structure_sum,
+    "Product": _structure_product,
+    "Div": _structure_div,
+    "Pow": _structure_pow,
+    "Function": _structure_function,
+    "Derivative": _structure_derivative,
+}
+
+
+def _collect_structure(expr, indent, out):
+    """Append the structure lines of expr to out
+
+    Walks the tree with an explicit stack instead of recursion, so deeply
+    nested expressions cannot hit Python's recursion limit. Stack entries are
+    either (Expr, indent) nodes or (str, indent) label lines. Nodes dispatch
+    on a single view.kind read instead of probing each is_* property.
+    """
+    stack = [(expr, indent)]
+    while stack:
+        node, indent = stack.pop()
+        prefix = _INDENTS[indent] if indent < len(_INDENTS) else "  " * indent
+
+        if isinstance(node, str):
+            out.append(f"{prefix}{node}")
+            continue
+
+        view = node.view()
+        _STRUCTURE_HANDLERS[view.kind](view, prefix, indent, stack, out)
+
+
+# Dict handlers: (view, result, stack) -> None.
+# Each fills result and pushes (child, child_dict) pairs for children.
+
+def _dict_number(view, result, stack):
+    result["value"] = view.value
+
+
+def _dict_symbol(view, result, stack):
+    result["name"] = view.name
+
+
+def _dict_nary(view, result, stack):
+    kids = view.children
+    result["children"] = [{} for _ in kids]
+    stack.extend(zip(kids, result["children"]))
+
+
+def _dict_binary(view, result, stack):
+    left, right = view.children
+    result["left"] = {}
+    result["right"] = {}
+    stack.append((left, result["left"]))
+    stack.append((right, result["right"]))
+
+
+def _dict_function(view, result, stack):
+    result["name"] = view.name
+    kids = view.children
+    result["args"] = [{} for _ in kids]
+    stack.extend(zip(kids, result["args"]))
+
+
+def _dict_derivative(view, result, stack):
+    result["var"] = view.derivative_var
+    result["order"] = view.derivative_order
+    result["inner"] = {}
+    stack.append((view[0], result["inner"]))
+
+
+_DICT_HANDLERS = {
+    "Number": _dict_number,
+    "Symbol": _dict_symbol,
+    "Sum": _dict_nary,
+    "Product": _dict_nary,
+    "Div": _dict_binary,
+    "Pow": _dict_binary,
+    "Function": _dict_function,
+    "Derivative": _dict_derivative,
+}
+
+
+def to_dict(expr):
+    """Convert expression to dictionary representation
+
+    Iterative like print_structure: each child's dict is allocated and linked
+    into its parent up front, then filled in when the child is popped.
+    """
+    root = {}
+    stack = [(expr, root)]
+    while stack:
+        node, result = stack.pop()
+        view = node.view()
+        kind = view.kind
+        result["kind"] = kind
+        _DICT_HANDLERS[kind](view, result, stack)
+
+    return root
 
 
 def main():
@@ -98,30 +235,6 @@ def main():
     print("\n\n5. CUSTOM CONVERSION (Example: to dict)")
     print("-" * 70)
     
-    def to_dict(expr):
-        """Convert expression to dictionary representation"""
-        view = expr.view()
-        result = {"kind": view.kind}
-        
-        if view.is_number:
-            result["value"] = view.value
-        elif view.is_symbol:
-            result["name"] = view.name
-        elif view.is_sum or view.is_product:
-            result["children"] = [to_dict(child) for child in view.children]
-        elif view.is_div or view.is_pow:
-            result["left"] = to_dict(view.children[0])
-            result["right"] = to_dict(view.children[1])
-        elif view.is_function:
-            result["name"] = view.name
-            result["args"] = [to_dict(child) for child in view.children]
-        elif view.is_derivative:
-            result["var"] = view.derivative_var
-            result["order"] = view.derivative_order
-            result["inner"] = to_dict(view.children[0])
-        
-        return result
-    
     expr = x.sin() + x**2
     print(f"Expression: {expr}")
     print(f"As dict:    {to_dict(expr)}")
@@ -135,15 +248,16 @@ def main():
     view = expr.view()
     print(f"Expression:   {expr}")
     print(f"View kind:    {view.kind}")
-    print(f"# Children:   {len(view.children)}")
+    print(f"# Children:   {len(view)}")
     
-    # Find the symbol child (not the number)
-    for i, child in enumerate(view.children):
-        child_view = child.view()
-        if child_view.is_symbol:
-            print(f"Symbol child: {child}")
-            print(f"Symbol name:  {child_view.name}")
-            break
+    # Find the symbol child (not the number), stopping at the first match
+    symbol_child = next(
+        (child for child in view.children if (child_view := child.view()).is_symbol),
+        None,
+    )
+    if symbol_child is not None:
+        print(f"Symbol child: {symbol_child}")
+        print(f"Symbol name:  {child_view.name}")
     else:
         print("(No symbol found in children)")
     print("             (Note: anonymous symbols show as '$ID')")
@@ -154,4 +268,21 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--profile" in sys.argv:
+        import cProfile
+
+        idx = sys.argv.index("--profile")
+        if idx + 1 >= len(sys.argv):
+            sys.exit("usage: view_api_demo.py [--profile PATH.prof]")
+        prof_path = sys.argv[idx + 1]
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            main()
+        finally:
+            profiler.disable()
+            profiler.dump_stats(prof_path)
+        print(f"Profile written to {prof_path} (view with: snakeviz {prof_path})")
+    else:
+        main()
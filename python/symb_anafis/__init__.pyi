@@ -753,6 +753,10 @@ class Diff:
         """Enable/disable domain-safe simplifications."""
         ...
 
+    def skip_simplification(self, skip: bool) -> "Diff":
+        """Skip simplification and return the raw derivative (for benchmarking)."""
+        ...
+
     def max_depth(self, depth: int) -> "Diff":
         """Set maximum expression depth limit."""
         ...
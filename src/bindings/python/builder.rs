@@ -40,6 +40,12 @@ impl PyDiff {
         self_
     }
 
+    /// Skip simplification and return the raw derivative (for benchmarking)
+    fn skip_simplification(mut self_: PyRefMut<'_, Self>, skip: bool) -> PyRefMut<'_, Self> {
+        self_.inner = self_.inner.clone().skip_simplification(skip);
+        self_
+    }
+
     /// Set a fixed variable for differentiation
     fn fixed_var<'py>(
         mut self_: PyRefMut<'py, Self>,
@@ -55,6 +55,16 @@ class TestApi(unittest.TestCase):
         result = builder.diff_str("sqrt(x)", "x")
         self.assertTrue("sqrt" in result or "1/" in result)
 
+    def test_diff_builder_skip_simplification(self):
+        # The simplifier folds 2*sin(x)*cos(x) into sin(2*x); the raw path must not
+        raw = Diff().skip_simplification(True).diff_str("sin(x)^2", "x")
+        default = Diff().diff_str("sin(x)^2", "x")
+        self.assertEqual(raw, "2*sin(x)*cos(x)")
+        self.assertEqual(default, "sin(2*x)")
+        self.assertNotEqual(raw, default)
+        # Disabling the flag again restores the default simplified output
+        self.assertEqual(Diff().skip_simplification(False).diff_str("sin(x)^2", "x"), default)
+
     def test_diff_builder_known_symbols(self):
         # In Python, we can register known symbols via fixed_var(s)
         # diff_str 3rd arg behavior is flaky/internal, using explicit builder API